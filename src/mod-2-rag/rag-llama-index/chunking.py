@@ -1,16 +1,18 @@
 """Intelligent chunking module for splitting restaurant menu documents into semantically meaningful chunks with menu-aware logic"""
 
-from typing import List
+from typing import List, Optional
 from llama_index.core import Document
+from llama_index.core.callbacks import CallbackManager
 from llama_index.core.node_parser import (
     SemanticSplitterNodeParser,
     SentenceSplitter
 )
-from llama_index.embeddings.openai import OpenAIEmbedding
 try:
     from . import config
+    from .embedding import get_embed_model
 except ImportError:
     import config
+    from embedding import get_embed_model
 
 class SmartChunker:
     
@@ -18,7 +20,8 @@ class SmartChunker:
         self,
         chunk_size: int = config.CHUNK_SIZE_TOKENS,
         chunk_overlap: int = config.CHUNK_OVERLAP_TOKENS,
-        use_semantic: bool = True
+        use_semantic: bool = True,
+        callback_manager: Optional[CallbackManager] = None
     ):
         """Initialize chunker with size limits and semantic splitting option."""
         self.chunk_size = chunk_size
@@ -26,10 +29,7 @@ class SmartChunker:
         self.use_semantic = use_semantic
         
         if use_semantic:
-            self.embed_model = OpenAIEmbedding(
-                model=config.EMBEDDING_MODEL,
-                api_key=config.OPENAI_API_KEY
-            )
+            self.embed_model = get_embed_model(model=config.EMBEDDING_MODEL, callback_manager=callback_manager)
             self.splitter = SemanticSplitterNodeParser(
                 embed_model=self.embed_model,
                 buffer_size=1,
@@ -199,6 +199,9 @@ class SmartChunker:
                 
         return items
 
-def create_chunking_pipeline(use_semantic: bool = True) -> SmartChunker:
+def create_chunking_pipeline(
+    use_semantic: bool = True,
+    callback_manager: Optional[CallbackManager] = None
+) -> SmartChunker:
     """Create configured chunking pipeline with semantic splitting option."""
-    return SmartChunker(use_semantic=use_semantic)
\ No newline at end of file
+    return SmartChunker(use_semantic=use_semantic, callback_manager=callback_manager)
\ No newline at end of file
@@ -9,6 +9,7 @@ load_dotenv()
 BASE_DIR = Path(__file__).parent.parent.parent
 STORAGE_DIR = BASE_DIR / "storage"
 OUTPUT_DIR = BASE_DIR / "src" / "rag-llama-index" / "output"
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", OUTPUT_DIR / "embedding_cache.db"))
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ASTRA_DB_TOKEN = os.getenv("ASTRA_DB_TOKEN")
@@ -22,8 +23,18 @@ ASTRA_DB_COLLECTION_ALLERGENS = os.getenv("ASTRA_DB_COLLECTION_ALLERGENS", "alle
 
 EMBEDDING_MODEL = "text-embedding-3-small"
 EMBEDDING_DIMENSION = 1536
+EMBEDDING_TIMEOUT_SECONDS = float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", "20"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "5"))
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", "250000"))
+BATCH_API_POLL_SECONDS = int(os.getenv("BATCH_API_POLL_SECONDS", "30"))
 CHUNK_SIZE_TOKENS = 350
 CHUNK_OVERLAP_TOKENS = 50
+# Nodes handed to the vector store per add() call; 2048 matches the VectorStoreIndex
+# default, and astrapy already splits each call into concurrent 50-document requests
+INDEX_INSERT_BATCH_SIZE = int(os.getenv("INDEX_INSERT_BATCH_SIZE", "2048"))
+INGESTION_NUM_WORKERS = int(os.getenv("INGESTION_NUM_WORKERS", "1"))
 
 SUPPORTED_FILE_TYPES = {
     "pdf": [".pdf"],
@@ -35,4 +46,6 @@ SUPPORTED_FILE_TYPES = {
 
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY")
 LANGFUSE_PUBLIC_KEY = os.getenv("LANGFUSE_PUBLIC_KEY")
-LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
\ No newline at end of file
+LANGFUSE_HOST = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
+LANGFUSE_FLUSH_AT = int(os.getenv("LANGFUSE_FLUSH_AT", "100"))
+LANGFUSE_FLUSH_INTERVAL = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "1.0"))
\ No newline at end of file
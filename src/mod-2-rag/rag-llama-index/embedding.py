@@ -0,0 +1,32 @@
+"""Shared OpenAI embedding client and tokenizer so chunking and indexing reuse one connection pool and one BPE table"""
+
+from functools import lru_cache
+from typing import Optional
+import tiktoken
+from llama_index.core.callbacks import CallbackManager
+from llama_index.embeddings.openai import OpenAIEmbedding
+try:
+    from . import config
+except ImportError:
+    import config
+
+@lru_cache(maxsize=None)
+def get_embed_model(
+    *,
+    model: str = config.EMBEDDING_MODEL,
+    callback_manager: Optional[CallbackManager] = None
+) -> OpenAIEmbedding:
+    """Return the process-wide embedding client for the given model and callback manager."""
+    return OpenAIEmbedding(
+        model=model,
+        api_key=config.OPENAI_API_KEY,
+        embed_batch_size=config.EMBEDDING_BATCH_SIZE,
+        timeout=config.EMBEDDING_TIMEOUT_SECONDS,
+        max_retries=config.EMBEDDING_MAX_RETRIES,
+        callback_manager=callback_manager
+    )
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model: str = config.EMBEDDING_MODEL) -> tiktoken.Encoding:
+    """Return the process-wide tiktoken encoding for the given embedding model."""
+    return tiktoken.encoding_for_model(model)
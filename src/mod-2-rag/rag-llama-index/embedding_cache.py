@@ -0,0 +1,73 @@
+"""On-disk embedding cache keyed by content hash so unchanged chunks are never re-embedded across pipeline runs"""
+
+import hashlib
+import sqlite3
+from array import array
+import threading
+from pathlib import Path
+from typing import List, Optional, Iterable, Tuple
+
+try:
+    from . import config
+except ImportError:
+    import config
+
+class EmbeddingCache:
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        cache_path: Path = config.EMBEDDING_CACHE_PATH,
+        embedding_model: str = config.EMBEDDING_MODEL,
+        embedding_dim: int = config.EMBEDDING_DIMENSION
+    ):
+        """Open the SQLite cache file and fix the model settings baked into every key."""
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.key_suffix = f"|{embedding_model}|{embedding_dim}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, embedding BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key(self, text: str) -> str:
+        """Build cache key from text content, embedding model and dimension."""
+        return hashlib.sha256((text + self.key_suffix).encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """Look up cached embeddings by key, returning None for every miss."""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self.LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + self.LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ))
+            
+        return [array("f", found[key]).tolist() if key in found else None for key in keys]
+
+    def set_many(self, items: Iterable[Tuple[str, List[float]]]):
+        """Store embeddings under their keys as packed float32 bytes."""
+        rows = [(key, array("f", embedding).tobytes()) for key, embedding in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the SQLite connection once no more lookups or writes are needed."""
+        with self._lock:
+            self._conn.close()
+
+def create_embedding_cache(
+    embedding_model: str = config.EMBEDDING_MODEL,
+    embedding_dim: int = config.EMBEDDING_DIMENSION
+) -> EmbeddingCache:
+    """Create embedding cache for the given embedding model settings."""
+    return EmbeddingCache(embedding_model=embedding_model, embedding_dim=embedding_dim)
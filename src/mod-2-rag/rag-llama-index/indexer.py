@@ -1,32 +1,62 @@
 """Unified indexing module supporting single and multi-collection vector database storage with Astra DB and document optimization"""
 
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Union
-from llama_index.core import VectorStoreIndex, StorageContext
+from openai import OpenAI
+from llama_index.core import VectorStoreIndex, StorageContext, Settings
 from llama_index.core import Document
+from llama_index.core.schema import BaseNode, MetadataMode
 from llama_index.vector_stores.astra_db import AstraDBVectorStore
-from llama_index.embeddings.openai import OpenAIEmbedding
-from llama_index.core.ingestion import IngestionPipeline
+from llama_index.core.ingestion import IngestionPipeline, run_transformations
 from llama_index.core.callbacks import CallbackManager
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import Retrying, retry, stop_after_attempt, wait_exponential
 try:
+    from .embedding import get_embed_model, get_tokenizer
+    from .embedding_cache import create_embedding_cache
     from . import config
 except ImportError:
+    from embedding import get_embed_model, get_tokenizer
+    from embedding_cache import create_embedding_cache
     import config
 
+# Retries a single Batch API request; whole batch jobs are never re-submitted
+api_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    reraise=True
+)
+
 class UnifiedIndexer:
+    VOLATILE_METADATA_KEYS = [
+        "doc_id",
+        "ingestion_timestamp",
+        "file_path",
+        "file_size",
+        "creation_date",
+        "last_modified_date",
+        "last_accessed_date"
+    ]
+    HASH_LOOKUP_BATCH_SIZE = 100
     
     def __init__(
         self,
         mode: str = "multi",
         embedding_model: str = config.EMBEDDING_MODEL,
         embedding_dim: int = config.EMBEDDING_DIMENSION,
-        callback_manager: Optional[CallbackManager] = None
+        callback_manager: Optional[CallbackManager] = None,
+        use_batch_api: bool = False
     ):
         """Initialize indexer with single or multi-collection configuration."""
         self.mode = mode
         self.embedding_model = embedding_model
         self.embedding_dim = embedding_dim
+        self.use_batch_api = use_batch_api
         self.embed_model = None
+        self.embedding_executor = None
+        self.embedding_cache = None
         self.collections = {}
         self.indexes = {}
         self.callback_manager = callback_manager
@@ -58,14 +88,24 @@ class UnifiedIndexer:
                     "optimization": "safety_critical"
                 }
             }
+            
+            optimizers = {
+                "semantic_food_focused": self._optimize_for_menu_search,
+                "structured_metadata": self._optimize_for_restaurant_info,
+                "promotional_content": self._optimize_for_coupon_search,
+                "safety_critical": self._optimize_for_allergen_safety
+            }
+            self.collection_optimizers = {
+                collection_name: optimizers[config_data["optimization"]]
+                for collection_name, config_data in self.collection_configs.items()
+            }
         
     def setup(self):
         """Set up embedding model and vector store connections."""
-        self.embed_model = OpenAIEmbedding(
-            model=self.embedding_model,
-            api_key=config.OPENAI_API_KEY,
-            embed_batch_size=10
-        )
+        self.embed_model = get_embed_model(model=self.embedding_model, callback_manager=self.callback_manager)
+        self.tokenizer = get_tokenizer(self.embedding_model)
+        self.embedding_executor = ThreadPoolExecutor(max_workers=config.EMBEDDING_MAX_CONCURRENCY)
+        self.embedding_cache = create_embedding_cache(self.embedding_model, self.embedding_dim)
         
         if self.mode == "single":
             self._setup_single_collection()
@@ -155,16 +195,7 @@ class UnifiedIndexer:
     
     def _optimize_for_collection(self, doc: Document, collection_name: str):
         """Apply collection-specific optimization to document."""
-        optimization = self.collection_configs[collection_name]["optimization"]
-        
-        if optimization == "semantic_food_focused":
-            self._optimize_for_menu_search(doc)
-        elif optimization == "structured_metadata":
-            self._optimize_for_restaurant_info(doc)
-        elif optimization == "promotional_content":
-            self._optimize_for_coupon_search(doc)
-        elif optimization == "safety_critical":
-            self._optimize_for_allergen_safety(doc)
+        self.collection_optimizers[collection_name](doc)
     
     def _optimize_for_menu_search(self, doc: Document):
         """Optimize document for food and menu-related searches."""
@@ -241,32 +272,28 @@ class UnifiedIndexer:
         doc.metadata["optimized_for"] = "allergen_safety"
         doc.metadata["safety_critical"] = True
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     def index_documents(
         self,
         documents: Union[List[Document], Dict[str, List[Document]]],
-        batch_size: int = 10
+        batch_size: int = config.INDEX_INSERT_BATCH_SIZE
     ) -> Dict[str, Any]:
-        """Index documents to Astra DB with embeddings and metadata."""
-        if self.mode == "single":
-            return self._index_single_collection(documents, batch_size)
-        else:
-            return self._index_multi_collections(documents, batch_size)
+        """Index documents to Astra DB with embeddings and metadata, retrying whole runs only without the Batch API."""
+        for attempt in Retrying(
+            stop=stop_after_attempt(1 if self.use_batch_api else 3),
+            wait=wait_exponential(multiplier=1, min=4, max=10),
+            reraise=True
+        ):
+            with attempt:
+                if self.mode == "single":
+                    return self._index_single_collection(documents, batch_size)
+                else:
+                    return self._index_multi_collections(documents, batch_size)
     
     def _index_single_collection(self, documents: List[Document], batch_size: int) -> Dict[str, Any]:
         """Index all documents into single collection."""
         collection_data = self.collections['main']
         
-        self.indexes['main'] = VectorStoreIndex.from_documents(
-            documents,
-            storage_context=collection_data["storage_context"],
-            embed_model=self.embed_model,
-            callback_manager=self.callback_manager,
-            show_progress=True
-        )
+        self.indexes['main'] = self._build_index(documents, collection_data, batch_size)
         
         return {
             "mode": "single",
@@ -275,43 +302,17 @@ class UnifiedIndexer:
         }
     
     def _index_multi_collections(self, categorized_docs: Dict[str, List[Document]], batch_size: int) -> Dict[str, Any]:
-        """Index documents into separate specialized collections."""
+        """Index documents into separate specialized collections concurrently."""
         results = {"mode": "multi", "collections": {}}
         
-        for collection_name, documents in categorized_docs.items():
-            if not documents:
-                results["collections"][collection_name] = {
-                    "status": "skipped", 
-                    "document_count": 0,
-                    "reason": "no documents"
-                }
-                continue
-                
-            try:
-                collection_data = self.collections[collection_name]
-                
-                index = VectorStoreIndex.from_documents(
-                    documents,
-                    storage_context=collection_data["storage_context"],
-                    embed_model=self.embed_model,
-                    callback_manager=self.callback_manager,
-                    show_progress=True
-                )
-                
-                self.indexes[collection_name] = index
-                
-                results["collections"][collection_name] = {
-                    "status": "success",
-                    "document_count": len(documents),
-                    "config": collection_data["config"]
-                }
-                
-            except Exception as e:
-                results["collections"][collection_name] = {
-                    "status": "failed",
-                    "error": str(e),
-                    "document_count": len(documents)
-                }
+        with ThreadPoolExecutor(max_workers=max(len(categorized_docs), 1)) as executor:
+            futures = {
+                collection_name: executor.submit(self._index_collection, collection_name, documents, batch_size)
+                for collection_name, documents in categorized_docs.items()
+            }
+            
+        for collection_name, future in futures.items():
+            results["collections"][collection_name] = future.result()
         
         results["total_documents"] = sum(
             r.get("document_count", 0) 
@@ -320,6 +321,205 @@ class UnifiedIndexer:
         
         return results
     
+    def _index_collection(self, collection_name: str, documents: List[Document], batch_size: int) -> Dict[str, Any]:
+        """Index documents into a single specialized collection."""
+        if not documents:
+            return {
+                "status": "skipped", 
+                "document_count": 0,
+                "reason": "no documents"
+            }
+            
+        try:
+            collection_data = self.collections[collection_name]
+            
+            self.indexes[collection_name] = self._build_index(documents, collection_data, batch_size)
+            
+            return {
+                "status": "success",
+                "document_count": len(documents),
+                "config": collection_data["config"]
+            }
+            
+        except Exception as e:
+            return {
+                "status": "failed",
+                "error": str(e),
+                "document_count": len(documents)
+            }
+    
+    def _build_index(
+        self,
+        documents: List[Document],
+        collection_data: Dict[str, Any],
+        batch_size: int = config.INDEX_INSERT_BATCH_SIZE
+    ) -> VectorStoreIndex:
+        """Split documents into length-ordered nodes, embed new content and store it in the collection."""
+        nodes = run_transformations(documents, Settings.transformations)
+        texts = {}
+        for node in nodes:
+            node.excluded_embed_metadata_keys = list(
+                set(node.excluded_embed_metadata_keys) | set(self.VOLATILE_METADATA_KEYS)
+            )
+            text = node.get_content(metadata_mode=MetadataMode.EMBED)
+            texts[node.node_id] = text
+            node.metadata["content_hash"] = self.embedding_cache.key(text)
+            node.excluded_embed_metadata_keys.append("content_hash")
+            node.excluded_llm_metadata_keys.append("content_hash")
+        nodes.sort(key=lambda node: len(texts[node.node_id]))
+        
+        nodes = self._skip_stored_nodes(nodes, collection_data["vector_store"])
+        self._embed_nodes(nodes, texts)
+            
+        return VectorStoreIndex(
+            nodes,
+            storage_context=collection_data["storage_context"],
+            embed_model=self.embed_model,
+            callback_manager=self.callback_manager,
+            insert_batch_size=batch_size,
+            show_progress=True
+        )
+    
+    def _skip_stored_nodes(self, nodes: List[BaseNode], vector_store: AstraDBVectorStore) -> List[BaseNode]:
+        """Drop nodes whose content hash is already stored in the collection."""
+        hashes = [node.metadata["content_hash"] for node in nodes]
+        stored = set()
+        
+        for start in range(0, len(hashes), self.HASH_LOOKUP_BATCH_SIZE):
+            cursor = vector_store.client.find(
+                {"metadata.content_hash": {"$in": hashes[start:start + self.HASH_LOOKUP_BATCH_SIZE]}},
+                projection={"metadata.content_hash": True}
+            )
+            stored.update(doc["metadata"]["content_hash"] for doc in cursor)
+            
+        return [node for node in nodes if node.metadata["content_hash"] not in stored]
+    
+    def _embed_nodes(self, nodes: List[BaseNode], texts: Dict[str, str]):
+        """Attach cached embeddings to nodes and embed each distinct uncached text once."""
+        cached = self.embedding_cache.get_many([node.metadata["content_hash"] for node in nodes])
+        
+        missing = []
+        for node, embedding in zip(nodes, cached):
+            node.embedding = embedding
+            if embedding is None:
+                missing.append(node)
+                
+        if not missing:
+            return
+            
+        unique = list({node.metadata["content_hash"]: node for node in missing}.values())
+        
+        if self.use_batch_api:
+            self._embed_with_batch_api(unique, texts)
+            
+        remaining = [node for node in unique if node.embedding is None]
+        embeddings = self._embed_texts([texts[node.node_id] for node in remaining])
+        for node, embedding in zip(remaining, embeddings):
+            node.embedding = embedding
+                
+        embeddings = {
+            node.metadata["content_hash"]: node.embedding
+            for node in unique
+            if node.embedding is not None
+        }
+        for node in missing:
+            node.embedding = embeddings.get(node.metadata["content_hash"])
+            
+        self.embedding_cache.set_many(embeddings.items())
+    
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches on the executor shared by all collections, preserving order."""
+        batches = self._pack_batches(texts)
+        results = list(self.embedding_executor.map(self.embed_model.get_text_embedding_batch, batches))
+            
+        return [embedding for batch in results for embedding in batch]
+    
+    def _pack_batches(self, texts: List[str]) -> List[List[str]]:
+        """Greedily pack texts into request batches bounded by input count and total tokens."""
+        max_inputs = self.embed_model.embed_batch_size
+        batches = []
+        batch = []
+        batch_tokens = 0
+        
+        token_counts = [len(tokens) for tokens in self.tokenizer.encode_ordinary_batch(texts)]
+        
+        for text, tokens in zip(texts, token_counts):
+            if batch and (len(batch) >= max_inputs or batch_tokens + tokens > config.EMBEDDING_BATCH_MAX_TOKENS):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+            
+        if batch:
+            batches.append(batch)
+            
+        return batches
+    
+    def _embed_with_batch_api(self, nodes: List[BaseNode], texts: Dict[str, str]):
+        """Embed nodes through the OpenAI Batch API, keeping any partial output and leaving failed nodes unembedded."""
+        client = OpenAI(api_key=config.OPENAI_API_KEY)
+        
+        requests = "\n".join(
+            json.dumps({
+                "custom_id": node.node_id,
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {
+                    "model": self.embedding_model,
+                    "input": texts[node.node_id]
+                }
+            })
+            for node in nodes
+        )
+        
+        input_file = api_retry(client.files.create)(
+            file=("embeddings.jsonl", requests.encode("utf-8")),
+            purpose="batch"
+        )
+        batch = api_retry(client.batches.create)(
+            input_file_id=input_file.id,
+            endpoint="/v1/embeddings",
+            completion_window="24h"
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(config.BATCH_API_POLL_SECONDS)
+            batch = api_retry(client.batches.retrieve)(batch.id)
+            
+        if batch.status != "completed":
+            print(f"  ⚠️ Embedding batch {batch.id} ended as '{batch.status}', embedding the rest interactively")
+            
+        embeddings = {}
+        if batch.output_file_id:
+            for line in api_retry(client.files.content)(batch.output_file_id).text.splitlines():
+                result = json.loads(line)
+                if result.get("response") and result["response"]["status_code"] == 200:
+                    embeddings[result["custom_id"]] = result["response"]["body"]["data"][0]["embedding"]
+        
+        for node in nodes:
+            node.embedding = embeddings.get(node.node_id)
+    
+    def delete_source_file(self, file_name: str, collection_name: Optional[str] = None) -> int:
+        """Delete all stored chunks of a source file, inferring its collection from the extension unless given, returning the count."""
+        if self.mode == "single":
+            vector_store = self.collections['main']['vector_store']
+        else:
+            collection_name = collection_name or self._collection_for_file(file_name)
+            vector_store = self.collections[collection_name]['vector_store']
+            
+        result = vector_store.client.delete_many({"metadata.file_name": file_name})
+        return result.deleted_count
+    
+    def _collection_for_file(self, file_name: str) -> str:
+        """Resolve the collection a source file is indexed into from its file extension."""
+        file_type = Path(file_name).suffix.lstrip(".").lower()
+        for collection_name, config_data in self.collection_configs.items():
+            if file_type in config_data["file_types"]:
+                return collection_name
+                
+        raise ValueError(f"Cannot infer collection for '{file_name}', pass collection_name explicitly")
+    
     def get_index(self, collection_name: Optional[str] = None) -> Optional[VectorStoreIndex]:
         """Get vector store index for specified collection."""
         if self.mode == "single":
@@ -346,9 +546,22 @@ class UnifiedIndexer:
             transformations=transformations + [self.embed_model],
             vector_store=vector_store
         )
+    
+    def close(self):
+        """Shut down the embedding thread pool and close the embedding cache."""
+        if self.embedding_executor:
+            self.embedding_executor.shutdown(wait=True)
+            self.embedding_executor = None
+        if self.embedding_cache:
+            self.embedding_cache.close()
+            self.embedding_cache = None
 
-def create_indexer(mode: str = "multi", callback_manager: Optional[CallbackManager] = None) -> UnifiedIndexer:
+def create_indexer(
+    mode: str = "multi",
+    callback_manager: Optional[CallbackManager] = None,
+    use_batch_api: bool = False
+) -> UnifiedIndexer:
     """Create and configure unified indexer with specified mode."""
-    indexer = UnifiedIndexer(mode=mode, callback_manager=callback_manager)
+    indexer = UnifiedIndexer(mode=mode, callback_manager=callback_manager, use_batch_api=use_batch_api)
     indexer.setup()
     return indexer
\ No newline at end of file
@@ -1,11 +1,14 @@
 """Document ingestion module for loading PDF, JSON, CSV, DOCX, and Markdown files from storage directory with metadata extraction"""
 
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+from collections import Counter
 import json
+import os
 import pandas as pd
 from llama_index.core import SimpleDirectoryReader, Document
+from llama_index.core.readers.file.base import default_file_metadata_func
 from llama_index.readers.file import DocxReader
 
 try:
@@ -13,6 +16,10 @@ try:
 except ImportError:
     import config
 
+# Each spawned reader worker re-imports llama_index (~1s), so a worker only pays
+# off once it has enough files to parse
+MIN_FILES_PER_WORKER = 16
+
 class DocumentIngestor:
     
     def __init__(self, storage_dir: Path = config.STORAGE_DIR):
@@ -36,10 +43,11 @@ class DocumentIngestor:
         documents.extend(md_docs)
         documents.extend(docx_docs)
         
+        ingestion_timestamp = datetime.now().isoformat()
         for idx, doc in enumerate(documents):
             doc.metadata.update({
                 "doc_id": f"doc_{idx:04d}",
-                "ingestion_timestamp": datetime.now().isoformat()
+                "ingestion_timestamp": ingestion_timestamp
             })
             
         return documents
@@ -56,7 +64,12 @@ class DocumentIngestor:
             recursive=False
         )
         
-        docs = reader.load_data()
+        num_workers = min(
+            config.INGESTION_NUM_WORKERS,
+            os.cpu_count() or 1,
+            len(reader.input_files) // MIN_FILES_PER_WORKER
+        )
+        docs = reader.load_data(num_workers=num_workers if num_workers > 1 else None)
         for doc in docs:
             doc.metadata["file_type"] = "pdf"
             doc.metadata["source_dir"] = "pdf"
@@ -138,18 +151,18 @@ class DocumentIngestor:
         if not md_files:
             return []
             
-        documents = []
-        for md_file in md_files:
-            reader = SimpleDirectoryReader(
-                input_files=[str(md_file)]
-            )
-            docs = reader.load_data()
-            for doc in docs:
-                doc.metadata["file_type"] = "markdown"
-                doc.metadata["source_dir"] = str(md_file.parent.relative_to(self.storage_dir))
-                documents.append(doc)
-                
-        return documents
+        reader = SimpleDirectoryReader(
+            input_files=[str(md_file) for md_file in md_files],
+            file_metadata=self._markdown_metadata
+        )
+        return reader.load_data()
+    
+    def _markdown_metadata(self, file_path: str) -> Dict[str, Any]:
+        """Build default file metadata plus markdown type and storage-relative source directory."""
+        metadata = default_file_metadata_func(file_path)
+        metadata["file_type"] = "markdown"
+        metadata["source_dir"] = str(Path(file_path).parent.relative_to(self.storage_dir))
+        return metadata
     
     def _ingest_docx(self) -> List[Document]:
         """Load DOCX files from doc subdirectory."""
@@ -193,20 +206,11 @@ class DocumentIngestor:
             if col in row and pd.notna(row[col]):
                 doc.metadata[col] = row[col]
     
-    def get_staging_summary(self) -> Dict[str, Any]:
-        """Generate summary statistics of ingested documents."""
-        docs = self.ingest_all()
-        summary = {
+    def get_staging_summary(self, documents: Optional[List[Document]] = None) -> Dict[str, Any]:
+        """Generate summary statistics of ingested documents, ingesting only if none are given."""
+        docs = documents if documents is not None else self.ingest_all()
+        return {
             "total_documents": len(docs),
-            "by_type": {},
-            "by_source_dir": {}
-        }
-        
-        for doc in docs:
-            file_type = doc.metadata.get("file_type", "unknown")
-            source_dir = doc.metadata.get("source_dir", "unknown")
-            
-            summary["by_type"][file_type] = summary["by_type"].get(file_type, 0) + 1
-            summary["by_source_dir"][source_dir] = summary["by_source_dir"].get(source_dir, 0) + 1
-            
-        return summary
\ No newline at end of file
+            "by_type": dict(Counter(doc.metadata.get("file_type", "unknown") for doc in docs)),
+            "by_source_dir": dict(Counter(doc.metadata.get("source_dir", "unknown") for doc in docs))
+        }
\ No newline at end of file
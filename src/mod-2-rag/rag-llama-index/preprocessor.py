@@ -28,10 +28,12 @@ class RAGPreprocessor:
         mode: str = "multi",
         storage_dir: Path = config.STORAGE_DIR,
         output_dir: Path = config.OUTPUT_DIR,
-        enable_tracing: bool = True
+        enable_tracing: bool = True,
+        use_batch_api: bool = False
     ):
         """Initialize RAG preprocessor with configuration and tracing."""
         self.mode = mode
+        self.use_batch_api = use_batch_api
         self.storage_dir = Path(storage_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -72,7 +74,7 @@ class RAGPreprocessor:
             self.tracer.trace_step("ingestion_start", self.storage_dir, None)
             
         self.documents = ingestor.ingest_all()
-        summary = ingestor.get_staging_summary()
+        summary = ingestor.get_staging_summary(self.documents)
         
         if self.tracer:
             self.tracer.trace_step("ingestion_complete", None, summary)
@@ -107,7 +109,8 @@ class RAGPreprocessor:
     
     def _run_chunking(self) -> Dict[str, Any]:
         """Split documents into semantic chunks."""
-        chunker = create_chunking_pipeline(use_semantic=True)
+        callback_manager = get_callback_manager(self.tracer) if self.tracer else None
+        chunker = create_chunking_pipeline(use_semantic=True, callback_manager=callback_manager)
         
         if self.tracer:
             self.tracer.trace_step("chunking_start", len(self.documents), None)
@@ -131,15 +134,22 @@ class RAGPreprocessor:
     def _run_indexing(self) -> Dict[str, Any]:
         """Index documents to Astra DB vector collections."""
         callback_manager = get_callback_manager(self.tracer) if self.tracer else None
-        self.indexer = create_indexer(mode=self.mode, callback_manager=callback_manager)
+        self.indexer = create_indexer(
+            mode=self.mode,
+            callback_manager=callback_manager,
+            use_batch_api=self.use_batch_api
+        )
         
         if self.tracer:
             self.tracer.trace_step("indexing_start", len(self.chunks), None)
             
         print("  ⏳ Categorizing and indexing documents...")
         
-        categorized = self.indexer.categorize_documents(self.chunks)
-        stats = self.indexer.index_documents(categorized)
+        try:
+            categorized = self.indexer.categorize_documents(self.chunks)
+            stats = self.indexer.index_documents(categorized)
+        finally:
+            self.indexer.close()
         
         if self.tracer:
             self.tracer.trace_step("indexing_complete", None, stats)
@@ -156,16 +166,18 @@ class RAGPreprocessor:
     
     def _save_results(self, results: Dict[str, Any]):
         """Save processing results and traces to output directory."""
-        results["execution_time"] = datetime.now().isoformat()
+        now = datetime.now()
+        results["execution_time"] = now.isoformat()
         results["configuration"] = {
             "mode": self.mode,
             "embedding_model": config.EMBEDDING_MODEL,
+            "embedding_api": "batch" if self.use_batch_api else "interactive",
             "chunk_size": config.CHUNK_SIZE_TOKENS,
             "storage_dir": str(self.storage_dir),
             "output_dir": str(self.output_dir)
         }
         
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         output_file = self.output_dir / f"preprocessing_results_{timestamp}.json"
         
         with open(output_file, 'w') as f:
@@ -177,21 +189,24 @@ class RAGPreprocessor:
             
         print(f"\n📁 Results saved to: {output_file}")
 
-def create_preprocessor(mode: str = "multi") -> RAGPreprocessor:
+def create_preprocessor(mode: str = "multi", use_batch_api: bool = False) -> RAGPreprocessor:
     """Create RAG preprocessor with specified collection mode."""
-    return RAGPreprocessor(mode=mode)
+    return RAGPreprocessor(mode=mode, use_batch_api=use_batch_api)
 
 def main():
     """Command-line entry point for RAG preprocessing pipeline."""
     import sys
     
-    mode = sys.argv[1] if len(sys.argv) > 1 else "multi"
+    args = sys.argv[1:]
+    use_batch_api = "--batch-api" in args
+    positional = [arg for arg in args if arg != "--batch-api"]
+    mode = positional[0] if positional else "multi"
     
-    if mode not in ["single", "multi"]:
-        print("Usage: python preprocessor.py [single|multi]")
+    if mode not in ["single", "multi"] or len(positional) > 1:
+        print("Usage: python preprocessor.py [single|multi] [--batch-api]")
         sys.exit(1)
     
-    preprocessor = create_preprocessor(mode=mode)
+    preprocessor = create_preprocessor(mode=mode, use_batch_api=use_batch_api)
     results = preprocessor.process()
     
     print(f"\n🎉 {mode.title()}-collection preprocessing completed successfully!")
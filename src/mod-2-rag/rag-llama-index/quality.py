@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from collections import Counter
 import json
 from pathlib import Path
 from llama_index.core import VectorStoreIndex
@@ -80,8 +81,16 @@ class QualityAssurance:
         critical_fields = ["restaurant", "cuisine", "section", "price_category"]
         optional_fields = ["dietary_options", "dishes", "search_tags"]
         
-        for field in critical_fields + optional_fields:
-            count = sum(1 for doc in documents if field in doc.metadata)
+        tracked_fields = critical_fields + optional_fields
+        tracked_set = set(tracked_fields)
+        field_counts = Counter(
+            field
+            for doc in documents
+            for field in doc.metadata.keys() & tracked_set
+        )
+        
+        for field in tracked_fields:
+            count = field_counts[field]
             coverage = count / len(documents) * 100
             report["metadata_coverage"][field] = {
                 "count": count,
@@ -192,7 +201,9 @@ class PipelineTracer:
             handler = langfuse_callback_handler(
                 secret_key=config.LANGFUSE_SECRET_KEY,
                 public_key=config.LANGFUSE_PUBLIC_KEY,
-                host=config.LANGFUSE_HOST
+                host=config.LANGFUSE_HOST,
+                flush_at=config.LANGFUSE_FLUSH_AT,
+                flush_interval=config.LANGFUSE_FLUSH_INTERVAL
             )
             self.callback_manager = CallbackManager([handler])
             print("Langfuse tracing enabled")
@@ -250,24 +261,14 @@ class PipelineTracer:
         if not self.traces:
             return {"message": "No traces available"}
             
-        summary = {
+        return {
             "total_steps": len(self.traces),
-            "steps": {},
-            "timeline": []
+            "steps": dict(Counter(trace["step"] for trace in self.traces)),
+            "timeline": [
+                {"time": trace["timestamp"], "step": trace["step"]}
+                for trace in self.traces
+            ]
         }
-        
-        for trace in self.traces:
-            step = trace["step"]
-            if step not in summary["steps"]:
-                summary["steps"][step] = 0
-            summary["steps"][step] += 1
-            
-            summary["timeline"].append({
-                "time": trace["timestamp"],
-                "step": step
-            })
-            
-        return summary
 
 def create_qa_suite(index: VectorStoreIndex) -> QualityAssurance:
     """Create quality assurance suite with vector store index."""
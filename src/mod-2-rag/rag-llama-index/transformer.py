@@ -1,6 +1,7 @@
 """Document transformation pipeline for cleaning text, normalizing sections, extracting menu items, and enriching restaurant metadata"""
 
 import re
+from collections import Counter
 from typing import List, Dict, Any, ClassVar
 from llama_index.core import Document
 from llama_index.core.schema import TransformComponent
@@ -362,6 +363,7 @@ class DocumentValidator:
             "quality_score": 0.0,
             "common_issues": {}
         }
+        common_issues = Counter()
         
         for doc in documents:
             validation = DocumentValidator.validate_document(doc)
@@ -370,9 +372,11 @@ class DocumentValidator:
             else:
                 results["invalid_documents"] += 1
                 
-            for issue in validation["missing_required"] + validation["missing_recommended"] + validation["warnings"]:
-                results["common_issues"][issue] = results["common_issues"].get(issue, 0) + 1
+            common_issues.update(validation["missing_required"])
+            common_issues.update(validation["missing_recommended"])
+            common_issues.update(validation["warnings"])
                 
+        results["common_issues"] = dict(common_issues)
         results["quality_score"] = results["valid_documents"] / results["total_documents"] * 100
         
         return results
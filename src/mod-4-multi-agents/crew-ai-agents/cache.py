@@ -0,0 +1,180 @@
+"""
+Persistent Response Cache
+
+Stores final crew recommendations in SQLite so repeated requests with the
+same preferences are answered without running the agents again.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LIST_FIELDS = ("allergens", "dietary_restrictions", "medical_conditions")
+CONFIG_DIR = Path(__file__).parent / "config"
+CONFIG_FILES = ("agents.yaml", "tasks.yaml")
+MEMORY_MAX_ENTRIES = 1024
+
+
+class ResponseCache:
+    """
+    Exact-match cache of recommendation reports keyed by normalized inputs.
+
+    A bounded in-memory LRU layer sits in front of SQLite so repeated lookups
+    within one process skip the database.
+
+    Matching is exact on purpose: two requests that differ only in their
+    allergens must never share a report, so similarity matching is unsafe.
+
+    Keys also include a fingerprint of the crew setup (model, temperature and
+    agent/task definitions), so changing any of them invalidates old reports.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: int, fingerprint: str = ""):
+        """
+        Initialize the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            ttl_seconds: Age after which a cached report is ignored
+            fingerprint: Identifier of the crew setup mixed into every key
+        """
+        self.ttl_seconds = ttl_seconds
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def key(self, inputs: Dict[str, Any]) -> str:
+        """
+        Build a cache key from customer preferences and the crew fingerprint.
+
+        Values are trimmed and lowercased, and comma-separated list fields
+        are sorted so equivalent requests map to the same key.
+
+        Args:
+            inputs: Customer preferences
+
+        Returns:
+            SHA-256 hex digest of the canonical preferences
+        """
+        normalized = {}
+        for field, value in inputs.items():
+            value = " ".join(str(value).lower().split())
+            if field in LIST_FIELDS:
+                value = ",".join(sorted(item.strip() for item in value.split(",") if item.strip()))
+            normalized[field] = value
+
+        canonical = json.dumps(
+            {"crew": self.fingerprint, "inputs": normalized},
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, inputs: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up a cached report for the given preferences.
+
+        Args:
+            inputs: Customer preferences
+
+        Returns:
+            Cached report, or None on a miss or expired entry
+        """
+        key = self.key(inputs)
+
+        with self._lock:
+            row = self._memory.get(key)
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT result, created_at FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+            if time.time() - row[1] > self.ttl_seconds:
+                self._memory.pop(key, None)
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._remember(key, row)
+        return row[0]
+
+    def set(self, inputs: Dict[str, Any], result: str):
+        """
+        Store a report for the given preferences.
+
+        Args:
+            inputs: Customer preferences
+            result: Final recommendation report
+        """
+        key = self.key(inputs)
+        created_at = time.time()
+
+        with self._lock:
+            self._remember(key, (result, created_at))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, result, created_at) VALUES (?, ?, ?)",
+                (key, result, created_at)
+            )
+            self._conn.commit()
+
+    def _remember(self, key: str, row: tuple):
+        """
+        Add or refresh an entry in the in-memory LRU, evicting the oldest.
+
+        Must be called with the lock held.
+
+        Args:
+            key: Cache key
+            row: Report and creation timestamp
+        """
+        self._memory[key] = row
+        self._memory.move_to_end(key)
+        while len(self._memory) > MEMORY_MAX_ENTRIES:
+            self._memory.popitem(last=False)
+
+
+def crew_fingerprint() -> str:
+    """
+    Hash everything besides the inputs that shapes a crew's report.
+
+    Returns:
+        SHA-256 hex digest of the model settings and the YAML configs
+    """
+    digest = hashlib.sha256()
+    digest.update(os.getenv("OPENAI_MODEL_NAME", "").encode("utf-8"))
+    digest.update(b"\0" + os.getenv("OPENAI_TEMPERATURE", "").encode("utf-8"))
+    for name in CONFIG_FILES:
+        digest.update(b"\0" + (CONFIG_DIR / name).read_bytes())
+    return digest.hexdigest()
+
+
+def create_response_cache() -> ResponseCache:
+    """
+    Create the response cache from environment settings.
+
+    Returns:
+        ResponseCache: Cache backed by RESPONSE_CACHE_PATH
+    """
+    return ResponseCache(
+        db_path=os.getenv("RESPONSE_CACHE_PATH", "response_cache.db"),
+        ttl_seconds=int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400")),
+        fingerprint=crew_fingerprint()
+    )
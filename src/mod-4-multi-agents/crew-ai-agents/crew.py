@@ -7,7 +7,7 @@ using built-in tools for autonomous restaurant recommendations.
 
 import os
 import warnings
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Optional
 from crewai import Agent, Crew, Task, Process
 from crewai.project import CrewBase, agent, crew, task
 from crewai_tools import FileReadTool
@@ -28,15 +28,29 @@ class RestaurantRecommendationCrew:
     Multi-agent crew for restaurant recommendations.
     
     Implements a sequential process where three specialized agents
-    collaborate to provide comprehensive dining recommendations.
+    collaborate to provide comprehensive dining recommendations. The
+    dietary and promotions checks only depend on the restaurant search,
+    so they run concurrently before the final recommendation.
     """
 
     agents_config = 'config/agents.yaml'
     tasks_config = 'config/tasks.yaml'
 
-    def __init__(self):
-        """Initialize the crew with necessary tools."""
+    def __init__(
+        self,
+        task_callback: Optional[Callable[[Any], None]] = None,
+        output_file: Optional[str] = "report.md"
+    ):
+        """
+        Initialize the crew with necessary tools.
+        
+        Args:
+            task_callback: Optional callback invoked as each task completes
+            output_file: File the final recommendation is written to, or None to skip writing
+        """
         self.storage_path = "storage"
+        self.task_callback = task_callback
+        self.output_file = output_file
         self._setup_tools()
 
     def _setup_tools(self):
@@ -87,7 +101,8 @@ class RestaurantRecommendationCrew:
         return Task(
             config=self.tasks_config['dietary_safety_check'],
             agent=self.dietary_specialist(),
-            context=[self.restaurant_search()]
+            context=[self.restaurant_search()],
+            async_execution=True
         )
 
     @task
@@ -96,7 +111,8 @@ class RestaurantRecommendationCrew:
         return Task(
             config=self.tasks_config['promotions_search'],
             agent=self.promotions_manager(),
-            context=[self.restaurant_search()]
+            context=[self.restaurant_search()],
+            async_execution=True
         )
 
     @task
@@ -110,7 +126,7 @@ class RestaurantRecommendationCrew:
                 self.dietary_safety_check(),
                 self.promotions_search()
             ],
-            output_file='report.md'
+            output_file=self.output_file
         )
 
     @crew
@@ -120,7 +136,8 @@ class RestaurantRecommendationCrew:
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=True,
+            task_callback=self.task_callback
         )
 
     def kickoff(self, inputs: Dict[str, Any]) -> str:
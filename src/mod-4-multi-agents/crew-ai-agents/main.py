@@ -10,14 +10,54 @@ warnings.filterwarnings("ignore", message=".*Pydantic.*")
 warnings.filterwarnings("ignore", message=".*pydantic.*")
 warnings.filterwarnings("ignore", message=".*model_fields.*")
 
-from crew import RestaurantRecommendationCrew  
+from cache import create_response_cache
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+import argparse
+import importlib
+import json
 import sys
 import time
 
+DEFAULT_PREFERENCES = {
+    "cuisine_type": "Italian",
+    "budget": "$30-60",
+    "location": "Savassi",
+    "party_size": "2",
+    "occasion": "Dinner",
+    "allergens": "none",
+    "dietary_restrictions": "none",
+    "medical_conditions": "none",
+    "dining_time": "7:00 PM",
+}
+
+PREFERENCE_PROMPTS = (
+    ("cuisine_type", "🍜 What type of cuisine?"),
+    ("budget", "💰 Budget per person?"),
+    ("location", "📍 Preferred area?"),
+    ("party_size", "👥 Party size?"),
+    ("occasion", "🎉 Occasion?"),
+)
+
+DIETARY_PROMPTS = (
+    ("allergens", "⚠️  Allergies?"),
+    ("dietary_restrictions", "🥗 Dietary restrictions?"),
+    ("medical_conditions", "🏥 Medical conditions?"),
+    ("dining_time", "🕐 Dining time?"),
+)
+
+AGENT_TEAM = (
+    ("🍴", "Restaurant Concierge", "Finding perfect restaurants matching your preferences"),
+    ("🥗", "Dietary Specialist", "Ensuring food safety and dietary compatibility"),
+    ("💰", "Promotions Manager", "Searching for the best deals and discounts"),
+)
+
+console = Console()
+
 def get_customer_input():
     """
     Collect customer dining preferences interactively.
@@ -25,8 +65,6 @@ def get_customer_input():
     Returns:
         dict: Customer preferences including cuisine, budget, location, etc.
     """
-    console = Console()
-    
     console.print(Panel.fit(
         "🍽️ Welcome to the AI Restaurant Recommendation System\n"
         "Powered by CrewAI Multi-Agent Collaboration",
@@ -37,41 +75,197 @@ def get_customer_input():
     
     inputs = {}
     
-    inputs["cuisine_type"] = Prompt.ask("🍜 What type of cuisine?", default="Italian")
-    inputs["budget"] = Prompt.ask("💰 Budget per person?", default="$30-60")
-    inputs["location"] = Prompt.ask("📍 Preferred area?", default="Savassi")
-    inputs["party_size"] = Prompt.ask("👥 Party size?", default="2")
-    inputs["occasion"] = Prompt.ask("🎉 Occasion?", default="Dinner")
+    for field, question in PREFERENCE_PROMPTS:
+        inputs[field] = Prompt.ask(question, default=DEFAULT_PREFERENCES[field])
     
     console.print("\n[bold]Dietary Requirements:[/bold]\n")
     
-    inputs["allergens"] = Prompt.ask("⚠️  Allergies?", default="none")
-    inputs["dietary_restrictions"] = Prompt.ask("🥗 Dietary restrictions?", default="none")
-    inputs["medical_conditions"] = Prompt.ask("🏥 Medical conditions?", default="none")
-    inputs["dining_time"] = Prompt.ask("🕐 Dining time?", default="7:00 PM")
+    for field, question in DIETARY_PROMPTS:
+        inputs[field] = Prompt.ask(question, default=DEFAULT_PREFERENCES[field])
     
     return inputs
 
 
-def display_agent_intro(console):
+def display_agent_intro():
     """
     Display introduction of the AI agents.
+    """
+    team = "\n".join(f"  {emoji} [cyan]{name}[/cyan]: {task}" for emoji, name, task in AGENT_TEAM)
+    
+    console.print(
+        "\n[bold yellow]🤖 Your AI Agent Team:[/bold yellow]\n"
+        f"{team}\n"
+        "\n[dim]Agents will collaborate to provide comprehensive recommendations...[/dim]\n"
+    )
+
+
+def run_crew(customer_inputs, cache):
+    """
+    Run a fresh crew for one set of customer preferences.
+    
+    Args:
+        customer_inputs: Customer preferences; missing fields use the defaults.
+        cache: Response cache checked before the crew runs, or None to skip it.
+    
+    Returns:
+        str: Final recommendation report.
+    """
+    customer_inputs = {**DEFAULT_PREFERENCES, **customer_inputs}
+    result = cache.get(customer_inputs) if cache else None
+    if result is None:
+        from crew import RestaurantRecommendationCrew
+        result = RestaurantRecommendationCrew(output_file=None).kickoff(customer_inputs)
+        if cache:
+            cache.set(customer_inputs, result)
+    return result
+
+
+def run_batch(input_file, max_workers, use_cache=True):
+    """
+    Generate recommendations for many customers concurrently.
+    
+    Each distinct input runs in its own crew on a worker thread; customers with
+    identical preferences share a single crew run. The crews do not write
+    report.md, since concurrent crews would overwrite each other's file; all
+    results go to batch_report.md instead. A failing input is reported in its
+    section of the batch report without stopping the others.
     
     Args:
-        console: Rich console instance for formatted output.
+        input_file: Path to a JSON file containing a list of preference objects.
+        max_workers: Maximum number of crews running at the same time.
+        use_cache: Whether to reuse and store reports in the response cache.
     """
-    console.print("\n[bold yellow]🤖 Your AI Agent Team:[/bold yellow]")
+    with open(input_file) as f:
+        inputs_list = json.load(f)
+    
+    if not isinstance(inputs_list, list) or not all(isinstance(item, dict) for item in inputs_list):
+        console.print(f"[bold red]❌ {input_file} must contain a JSON list of preference objects[/bold red]")
+        sys.exit(1)
+    
+    results = [None] * len(inputs_list)
+    failed = 0
+    cache = create_response_cache() if use_cache else None
     
-    agents = [
-        ("🍴", "Restaurant Concierge", "Finding perfect restaurants matching your preferences"),
-        ("🥗", "Dietary Specialist", "Ensuring food safety and dietary compatibility"),
-        ("💰", "Promotions Manager", "Searching for the best deals and discounts")
+    unique_inputs = {}
+    for index, customer_inputs in enumerate(inputs_list):
+        customer_inputs = {**DEFAULT_PREFERENCES, **customer_inputs}
+        key = cache.key(customer_inputs) if cache else json.dumps(customer_inputs, sort_keys=True)
+        unique_inputs.setdefault(key, (customer_inputs, []))[1].append(index)
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("{task.completed}/{task.total}"),
+        console=console,
+        refresh_per_second=4,
+    ) as progress:
+        batch_task = progress.add_task("[cyan]Agents working on batch...", total=len(inputs_list))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(run_crew, customer_inputs, cache): indices
+                for customer_inputs, indices in unique_inputs.values()
+            }
+            
+            for future in as_completed(futures):
+                indices = futures[future]
+                error = future.exception()
+                if error:
+                    failed += len(indices)
+                    result = f"❌ Error: {error}"
+                else:
+                    result = future.result()
+                for index in indices:
+                    results[index] = result
+                progress.advance(batch_task, len(indices))
+    
+    sections = [
+        f"## {customer_inputs.get('occasion', DEFAULT_PREFERENCES['occasion'])} - "
+        f"{customer_inputs.get('cuisine_type', DEFAULT_PREFERENCES['cuisine_type'])}\n\n{result}\n\n"
+        for customer_inputs, result in zip(inputs_list, results)
     ]
+    Path("batch_report.md").write_text("# Restaurant Recommendations (Batch)\n\n" + "".join(sections))
+    
+    console.print(f"\n✅ {len(results) - failed}/{len(results)} recommendations saved to 'batch_report.md'")
+
+
+def preload_crew():
+    """
+    Start importing the crew module on a background thread.
+    
+    Returns:
+        Future: Resolves to the crew module; import errors are raised by result().
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    crew_import = executor.submit(importlib.import_module, "crew")
+    executor.shutdown(wait=False)
+    return crew_import
+
+
+def run_interactive(customer_inputs, crew_import):
+    """
+    Run the crew for one customer with live progress output.
+    
+    Args:
+        customer_inputs: Customer preferences collected interactively.
+        crew_import: Future from preload_crew() resolving to the crew module.
+    
+    Returns:
+        tuple: Final recommendation report and elapsed seconds.
+    """
+    display_agent_intro()
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        refresh_per_second=4,
+    ) as progress:
+        
+        task1 = progress.add_task("[cyan]Initializing AI agents...", total=None)
+        RestaurantRecommendationCrew = crew_import.result().RestaurantRecommendationCrew
+        completed_tasks = []
+        
+        def on_task_complete(output):
+            completed_tasks.append(output)
+            progress.update(
+                task2,
+                description=f"[cyan]Agents collaborating... {len(completed_tasks)}/{total_tasks} tasks done ({output.agent})"
+            )
+        
+        crew = RestaurantRecommendationCrew(task_callback=on_task_complete)
+        total_tasks = len(crew.crew().tasks)
+        progress.update(task1, description="[green]✓ Agents initialized")
+        
+        task2 = progress.add_task("[cyan]Agents collaborating on recommendations...", total=None)
+        
+        console.print("\n[bold]Agent Activity Log:[/bold]\n" + "-" * 50)
+        
+        start_time = time.perf_counter()
+        try:
+            result = crew.kickoff(customer_inputs)
+            elapsed = time.perf_counter() - start_time
+            progress.update(task2, description=f"[green]✓ Completed in {elapsed:.1f}s")
+        except Exception as e:
+            progress.update(task2, description="[red]✗ Error during execution")
+            raise e
     
-    for emoji, name, task in agents:
-        console.print(f"  {emoji} [cyan]{name}[/cyan]: {task}")
+    return result, elapsed
+
+
+def parse_args():
+    """
+    Parse command-line arguments.
     
-    console.print("\n[dim]Agents will collaborate to provide comprehensive recommendations...[/dim]\n")
+    Returns:
+        argparse.Namespace: Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="AI Restaurant Recommendation System")
+    parser.add_argument("--input-file", help="JSON file with a list of customer preferences to process in batch")
+    parser.add_argument("--max-workers", type=int, default=4, help="Concurrent crews in batch mode (default: 4)")
+    parser.add_argument("--no-cache", action="store_true", help="Always run the agents, bypassing the response cache")
+    return parser.parse_args()
 
 
 def main():
@@ -81,35 +275,25 @@ def main():
     Orchestrates the multi-agent recommendation process with
     interactive input, progress tracking, and result display.
     """
-    console = Console()
+    args = parse_args()
     
     try:
+        if args.input_file:
+            run_batch(args.input_file, args.max_workers, use_cache=not args.no_cache)
+            return
+        
         customer_inputs = get_customer_input()
-        display_agent_intro(console)
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            
-            task1 = progress.add_task("[cyan]Initializing AI agents...", total=None)
-            crew = RestaurantRecommendationCrew()
-            time.sleep(1)
-            progress.update(task1, description="[green]✓ Agents initialized")
-            
-            task2 = progress.add_task("[cyan]Agents collaborating on recommendations...", total=None)
-            
-            console.print("\n[bold]Agent Activity Log:[/bold]")
-            console.print("-" * 50)
-            
-            start_time = time.time()
-            try:
-                result = crew.kickoff(customer_inputs)
-                elapsed = time.time() - start_time
-                progress.update(task2, description=f"[green]✓ Completed in {elapsed:.1f}s")
-            except Exception as e:
-                progress.update(task2, description="[red]✗ Error during execution")
-                raise e
+        cache = None if args.no_cache else create_response_cache()
+        result = cache.get(customer_inputs) if cache else None
+        
+        if result is not None:
+            console.print("\n[dim]⚡ Found a saved recommendation for these preferences[/dim]")
+            timing = "Served from cache (agents were not run)"
+        else:
+            result, elapsed = run_interactive(customer_inputs, preload_crew())
+            timing = f"Total execution time: {elapsed:.2f} seconds"
+            if cache:
+                cache.set(customer_inputs, result)
         
         console.print("\n")
         console.print(Panel(
@@ -119,19 +303,22 @@ def main():
             expand=False
         ))
         
-        console.print("\n[bold]📊 Process Statistics:[/bold]")
-        console.print(f"  • Total execution time: {elapsed:.2f} seconds")
-        console.print(f"  • Agents used: 3 (Concierge, Dietary, Promotions)")
-        console.print(f"  • Tools executed: Multiple searches and validations")
+        console.print(
+            "\n[bold]📊 Process Statistics:[/bold]\n"
+            f"  • {timing}\n"
+            f"  • Agents used: {len(AGENT_TEAM)} (Concierge, Dietary, Promotions)\n"
+            "  • Tools executed: Multiple searches and validations"
+        )
         save_report = Prompt.ask("\n💾 Save this report?", choices=["y", "n"], default="y")
         
         if save_report == "y":
-            with open("report.md", "w") as f:
-                f.write(f"# Restaurant Recommendations\n\n")
-                f.write(f"Generated for: {customer_inputs['occasion']}\n")
-                f.write(f"Party size: {customer_inputs['party_size']}\n\n")
-                f.write(result)
-            console.print("✅ Report saved as 'recommendation_report.md'")
+            Path("report.md").write_text(
+                f"# Restaurant Recommendations\n\n"
+                f"Generated for: {customer_inputs['occasion']}\n"
+                f"Party size: {customer_inputs['party_size']}\n\n"
+                f"{result}"
+            )
+            console.print("✅ Report saved as 'report.md'")
         
     except KeyboardInterrupt:
         console.print("\n[bold red]❌ Operation cancelled[/bold red]")